@@ -12,18 +12,24 @@ The following information can be extracted from such a FIT file:
     - air power [%];
     - form power [W];
     - leg spring stiffness [kN/m].
+
+Each FIT file is only parsed once (as long as it is not modified): the values for all data types are extracted in a
+single pass and cached.  To get the values for several data types at once, aligned per record, use get_all.
 """
 
+import functools
+import os
 from enum import Enum
 
 import numpy as np
 from fitdecode import FitReader
 from fitdecode.records import FitDataMessage
 
-ANGLE_CONVERSION = 2.**32 / 360.
+DEGREES_PER_COUNT = 360. / 2.**32  # Angle represented by one unit of an angular coordinate in a FIT file [degrees]
+RECORD_SIZE_HINT = 20  # Lower bound for the size of a record in a FIT file [bytes]
 
 
-def angular_coordinate_to_degrees(angular_coordinates: np.uint32) -> float:
+def angular_coordinate_to_degrees(angular_coordinates: np.uint32, out: np.array = None) -> float:
     """ Convert the given angular coordinate(s) from a FIT file to degrees.
 
     Garmin stores its angular coordinates using a 32-bit integer (which gives 2**32 possible values).  These
@@ -31,11 +37,13 @@ def angular_coordinate_to_degrees(angular_coordinates: np.uint32) -> float:
 
     Args:
         - angular_coordinates: Angular coordinate(s) as stored in a FIT file (as a 32-bit integer).
+        - out: Optional (float) array in which to store the result.  This can be the given angular coordinates
+               themselves, to convert them in place.
 
     Returns: Angular coordinates [degrees].
     """
 
-    return angular_coordinates / ANGLE_CONVERSION
+    return np.multiply(angular_coordinates, DEGREES_PER_COUNT, out=out)
 
 
 class DataType(str, Enum):
@@ -69,6 +77,16 @@ class DataType(str, Enum):
     LEG_SPRING_STIFFNESS = "Leg Spring Stiffness"
 
 
+# Conversions of the values extracted from a FIT file, for the data types that are not returned in the unit in which
+# they are stored.  These are applied in place, as the arrays built by _get_data are not shared with anything else.
+
+_CONVERSIONS = {
+    DataType.LATITUDE: lambda latitude: angular_coordinate_to_degrees(latitude, out=latitude),
+    DataType.LONGITUDE: lambda longitude: angular_coordinate_to_degrees(longitude, out=longitude),
+    DataType.CADENCE: lambda cadence: np.multiply(cadence, 2., out=cadence),  # rpm -> spm
+}
+
+
 def get_latitude(fit_filename: str) -> (np.array, np.array):
     """ Extract the latitude values from the FIT file with the given filename.
 
@@ -80,9 +98,7 @@ def get_latitude(fit_filename: str) -> (np.array, np.array):
         - Numpy array with the latitude from the FIT file with the given filename [degrees].
     """
 
-    time, latitude = _get_data(fit_filename, DataType.LATITUDE)
-
-    return time, angular_coordinate_to_degrees(latitude)
+    return _get_data(fit_filename, DataType.LATITUDE)
 
 
 def get_longitude(fit_filename: str) -> (np.array, np.array):
@@ -96,9 +112,7 @@ def get_longitude(fit_filename: str) -> (np.array, np.array):
         - Numpy array with the longitude from the FIT file with the given filename [degrees].
     """
 
-    time, longitude = _get_data(fit_filename, DataType.LONGITUDE)
-
-    return time, angular_coordinate_to_degrees(longitude)
+    return _get_data(fit_filename, DataType.LONGITUDE)
 
 
 def get_power(fit_filename: str) -> (np.array, np.array):
@@ -143,9 +157,7 @@ def get_cadence(fit_filename: str) -> (np.array, np.array):
         - Numpy array with the cadence from the FIT file with the given filename [spm].
     """
 
-    time, cadence = _get_data(fit_filename, DataType.CADENCE)
-
-    return time, 2 * cadence
+    return _get_data(fit_filename, DataType.CADENCE)
 
 
 def get_ground_contact_time(fit_filename) -> (np.array, np.array):
@@ -221,6 +233,40 @@ def get_leg_spring_stiffness(fit_filename: str) -> (np.array, np.array):
     return _get_data(fit_filename, DataType.LEG_SPRING_STIFFNESS)
 
 
+def get_all(fit_filename: str, data_types: list = None) -> dict:
+    """ Extract the values for the given data types from the FIT file with the given filename, in a single pass.
+
+    Unlike the arrays returned by the get_* functions, the returned arrays are aligned: they have an entry for each
+    record in the FIT file, which is NaN for the records without a value for that data type.
+
+    Args:
+        - fit_filename: Filename of the FIT file from which to extract the data.
+        - data_types: Data types for which to extract the data.  If None, the data for all data types is extracted.
+
+    Returns: Dictionary with, for each of the given data types, a numpy array with the values from the FIT file with
+             the given filename, in the same unit as the corresponding get_* function.  For DataType.TIME, these are the
+             timestamps, in seconds since the first record.
+    """
+
+    columns = _parse_fit_file(fit_filename, os.path.getmtime(fit_filename))
+
+    if data_types is None:
+        data_types = list(DataType)
+
+    all_data = {}
+
+    for data_type in data_types:
+
+        data = columns[data_type].copy()
+
+        if data_type in _CONVERSIONS:
+            _CONVERSIONS[data_type](data)
+
+        all_data[data_type] = data
+
+    return all_data
+
+
 def _get_data(fit_filename: str, data_type: DataType) -> (np.array, np.array):
     """ Extract the values from the FIT file with the given filename for the given data type.
 
@@ -230,13 +276,59 @@ def _get_data(fit_filename: str, data_type: DataType) -> (np.array, np.array):
 
     Returns:
         - Numpy array with the timestamps from the FIT file with the given filename.
-        - Numpy array with the values from the FIT file with the given filename for the given data type.
+        - Numpy array with the values from the FIT file with the given filename for the given data type, converted to
+          the unit in which the corresponding get_* function returns them (see _CONVERSIONS).
+    """
+
+    columns = _parse_fit_file(fit_filename, os.path.getmtime(fit_filename))
+
+    data = columns[data_type]
+    has_value = ~np.isnan(data)
+
+    time = columns[DataType.TIME][has_value]
+
+    if len(time) != 0:
+        time -= time[0]
+
+    data = data[has_value]
+
+    if data_type in _CONVERSIONS:
+        _CONVERSIONS[data_type](data)
+
+    return time, data
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_fit_file(fit_filename: str, mtime: float) -> dict:
+    """ Extract the values for all data types from the FIT file with the given filename, in a single pass.
+
+    The result is cached, so that extracting several data types from the same FIT file only requires the file to be
+    parsed once.  The modification time of the file is part of the cache key, so that a modified file is parsed again.
+
+    Args:
+        - fit_filename: Filename of the FIT file from which to extract the data.
+        - mtime: Modification time of the FIT file with the given filename.
+
+    Returns: Dictionary with a read-only numpy array per data type, with one entry per record in the FIT file with the
+             given filename.  For DataType.TIME, these are the timestamps, in seconds since the first record.  Records
+             without a value for a data type are set to NaN.
     """
 
-    time = np.array([])
-    data = np.array([])
+    data_types = list(DataType)
+    time_index = data_types.index(DataType.TIME)
+
+    # Pre-allocate the columns, based on the size of the FIT file (and grow them if needed)
+
+    size_hint = max(os.path.getsize(fit_filename) // RECORD_SIZE_HINT, 1)
+
+    columns = np.full((len(data_types), size_hint), np.nan)
+    num_records = 0
+
+    # Position of the field for each data type in the fields of the records, per layout of these fields, so that the
+    # fields don't have to be looked up by name in each record.  The layout is determined by the definition message
+    # and by the number of fields (fitdecode may add a timestamp or leave out expanded components).
 
-    time0 = None
+    field_positions = {}
 
     with FitReader(fit_filename) as fit_file:
 
@@ -246,19 +338,72 @@ def _get_data(fit_filename: str, data_type: DataType) -> (np.array, np.array):
 
                 if frame.name == "record":
 
-                    if frame.has_field(data_type):
+                    fields = frame.fields
+                    layout = (frame.def_mesg, len(fields))
 
-                        timepoint = frame.get_value(DataType.TIME)
-                        value = frame.get_value(data_type)
+                    if layout not in field_positions:
+                        field_positions[layout] = _get_field_positions(fields, data_types)
 
-                        if value is not None:
+                    positions = field_positions[layout]
 
-                            print(f"Value: {value}")
-                            data = np.append(data, float(value))
+                    # Raw timestamps are expressed in seconds (since the FIT epoch)
 
-                            if time0 is None:
-                                time0 = frame.get_value(DataType.TIME)
+                    if time_index not in positions:
+                        continue
 
-                            time = np.append(time, (timepoint - time0).total_seconds())
+                    timepoint = fields[positions[time_index]].raw_value
 
-    return time, data
+                    if timepoint is None:
+                        continue
+
+                    if num_records == columns.shape[1]:
+                        columns = np.concatenate((columns, np.full_like(columns, np.nan)), axis=1)
+
+                    columns[time_index, num_records] = timepoint
+
+                    for index, position in positions.items():
+
+                        if index != time_index:
+
+                            value = fields[position].value
+
+                            if value is not None:
+                                columns[index, num_records] = value
+
+                    num_records += 1
+
+    columns = columns[:, :num_records].copy()
+
+    if num_records != 0:
+        columns[time_index] -= columns[time_index, 0]
+
+    columns.flags.writeable = False
+
+    return {data_type: columns[index] for index, data_type in enumerate(data_types)}
+
+
+def _get_field_positions(fields: list, data_types: list) -> dict:
+    """ Determine the position of the field for each of the given data types in the given fields of a record.
+
+    Args:
+        - fields: Fields of a record in a FIT file.
+        - data_types: Data types for which to determine the position of the field.
+
+    Returns: Dictionary with, for each data type that is present in the given fields, its index in the given data types
+             as key and the position of its (first) field in the given fields as value.
+    """
+
+    positions = {}
+
+    for position, field in enumerate(fields):
+
+        name = field.name_or_num
+
+        if name in data_types:
+
+            index = data_types.index(name)
+
+            if index not in positions:
+                positions[index] = position
+
+    return positions
@@ -40,13 +40,14 @@ If that file is located at a specific location, also use the ``location=`` keywo
 The above code will read the complete YAML file, i.e. all the groups into a dictionary.
 
 """
+import functools
 import inspect
 import itertools
 import logging
+import os
 import pathlib
 import re
 from collections import namedtuple
-from typing import NamedTuple
 
 import yaml  # This module is provided by the pip package PyYaml - pip install pyyaml
 from rich.text import Text
@@ -54,6 +55,10 @@ from rich.tree import Tree
 
 logger = logging.getLogger(__name__)
 
+_THIS_FILE_LOCATION = pathlib.Path(__file__).resolve().parent
+
+CallerInfo = namedtuple("CallerInfo", "filename function lineno")
+
 
 class SettingsError(Exception):
     pass
@@ -75,20 +80,40 @@ def set_attr_value(cls, name, value):
         raise KeyError(f"Overwriting setting {name} with {value}, was {hasattr(cls, name)}")
 
 
-# Fix the problem: YAML loads 5e-6 as string and not a number
-# https://stackoverflow.com/questions/30458977/yaml-loads-5e-6-as-string-and-not-a-number
+try:
+    from yaml import CSafeLoader as SafeLoader  # Much faster, but only available when PyYAML was built with libyaml
+except ImportError:
+    from yaml import SafeLoader
+
+
+@functools.cache
+def _get_loader():
+    """
+    Returns the YAML loader for the settings files. The loader is only created when the first
+    settings file is read.
+
+    The loader is a subclass of the (C)SafeLoader, so that registering the implicit resolver
+    below doesn't affect any other YAML loader in the process.
+    """
+
+    class SettingsLoader(SafeLoader):
+        pass
+
+    # Fix the problem: YAML loads 5e-6 as string and not a number
+    # https://stackoverflow.com/questions/30458977/yaml-loads-5e-6-as-string-and-not-a-number
+
+    SettingsLoader.add_implicit_resolver(
+        u'tag:yaml.org,2002:float',
+        re.compile(u"""^(?:
+         [-+]?(?:[0-9][0-9_]*)\\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |\\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\\.[0-9_]*
+        |[-+]?\\.(?:inf|Inf|INF)
+        |\\.(?:nan|NaN|NAN))$""", re.X),
+        list(u'-+0123456789.'))
 
-SAFE_LOADER = yaml.SafeLoader
-SAFE_LOADER.add_implicit_resolver(
-    u'tag:yaml.org,2002:float',
-    re.compile(u"""^(?:
-     [-+]?(?:[0-9][0-9_]*)\\.[0-9_]*(?:[eE][-+]?[0-9]+)?
-    |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
-    |\\.[0-9_]+(?:[eE][-+][0-9]+)?
-    |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\\.[0-9_]*
-    |[-+]?\\.(?:inf|Inf|INF)
-    |\\.(?:nan|NaN|NAN))$""", re.X),
-    list(u'-+0123456789.'))
+    return SettingsLoader
 
 
 class Settings:
@@ -98,6 +123,7 @@ class Settings:
     """
 
     __memoized_yaml = {}  # Memoized settings yaml files
+    __memoized_yaml_locations = {}  # Memoized locations of the settings yaml files
 
     @classmethod
     def read_configuration_file(cls, filename: str, *, force=False):
@@ -118,7 +144,7 @@ class Settings:
 
             with open(filename, "r") as stream:
                 try:
-                    yaml_document = yaml.load(stream, Loader=SAFE_LOADER)
+                    yaml_document = yaml.load(stream, Loader=_get_loader())
                 except yaml.YAMLError as exc:
                     logger.error(exc)
                     raise SettingsError(f"Error loading YAML document {filename}") from exc
@@ -154,7 +180,7 @@ class Settings:
             group_name (str): the name of one of the main groups from the YAML file
             filename (str): the name of the YAML file to read
             location (str): the path to the location of the YAML file
-            force (bool): force reloading the file
+            force (bool): force reloading the file (and locating it again)
             add_local_settings (bool): update the Settings with site specific local settings
 
         Returns:
@@ -164,25 +190,40 @@ class Settings:
             - SettingsError when the group is not defined in the YAML file
         """
 
-        _THIS_FILE_LOCATION = pathlib.Path(__file__).resolve().parent
+        # The location of the YAML file only depends on the given filename and location, and on the location of the
+        # caller (when no location is given) or the current working directory (when a relative location is given).
+        # As resolving it is relatively expensive, it is memoized as well.
 
         if location is None:
+            caller_filename = inspect.currentframe().f_back.f_code.co_filename
+            location_key = (filename, location, caller_filename)
+        elif os.path.isabs(location):
+            location_key = (filename, location, None)
+        else:
+            location_key = (filename, location, os.getcwd())
+
+        yaml_location = None if force else cls.__memoized_yaml_locations.get(location_key)
 
-            # Check if the yaml file is located at the location of the caller,
-            # if not, use the file that is located where the Settings module is located.
+        if yaml_location is None:
 
-            caller_dir = get_caller_info(level=2).filename
-            caller_dir = pathlib.Path(caller_dir).resolve().parent
+            if location is None:
 
-            if (caller_dir / filename).is_file():
-                yaml_location = caller_dir
+                # Check if the yaml file is located at the location of the caller,
+                # if not, use the file that is located where the Settings module is located.
+
+                caller_dir = pathlib.Path(caller_filename).resolve().parent
+
+                if (caller_dir / filename).is_file():
+                    yaml_location = caller_dir
+                else:
+                    yaml_location = _THIS_FILE_LOCATION
             else:
-                yaml_location = _THIS_FILE_LOCATION
-        else:
 
-            # The location was given as an argument
+                # The location was given as an argument
+
+                yaml_location = pathlib.Path(location).resolve()
 
-            yaml_location = pathlib.Path(location).resolve()
+            cls.__memoized_yaml_locations[location_key] = yaml_location
 
         logger.log(5, f"yaml_location in Settings.load(location={location}) is {yaml_location}")
 
@@ -248,7 +289,7 @@ class Settings:
         return msg
 
 
-def get_caller_info(level=1) -> NamedTuple:
+def get_caller_info(level=1) -> CallerInfo:
     """
     Returns the filename, function name and lineno of the caller.
 
@@ -270,11 +311,10 @@ def get_caller_info(level=1) -> NamedTuple:
         if frame.f_back is None:
             break
         frame = frame.f_back
-    frame_info = inspect.getframeinfo(frame)
 
-    caller_info = namedtuple("CallerInfo", "filename function lineno")
+    # Take the information straight from the frame: inspect.getframeinfo would also read the source code of the caller
 
-    return caller_info(frame_info.filename, frame_info.function, frame_info.lineno)
+    return CallerInfo(frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno)
 
 
 class AttributeDict(dict):
@@ -319,7 +359,7 @@ class AttributeDict(dict):
         # We only want the first 10 key:value pairs
 
         count = 10
-        sub_msg = ", ".join(f"{k!r}:{v!r}" for k, v in itertools.islice(self.items(), 0, count))
+        sub_msg = ", ".join([f"{k!r}:{v!r}" for k, v in itertools.islice(self.items(), count)])
 
         # if we left out key:value pairs, print a ', ...' to indicate incompleteness
 
@@ -1,4 +1,19 @@
+import functools
+import logging
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import numba
+except ImportError:  # Numba is optional: without it, window functions are called from Python
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+# NumPy reductions that can be applied to all windows at once (along the last axis)
+
+NUMPY_REDUCTIONS = frozenset((np.sum, np.mean, np.median, np.min, np.max, np.amin, np.amax, np.std, np.var))
 
 
 def moving_window(time, signal, window_length, time_step, function, time0=None, pass_time_in_window=True, **kwargs):
@@ -18,6 +33,10 @@ def moving_window(time, signal, window_length, time_step, function, time0=None,
         - function: Function that will be applied to each window, with the signature:
                      - function(timeInWindow, signalInWindow)     by default.
                      - function(signalInWindow)                   if pass_time_in_window == False.
+                    When this is one of the NUMPY_REDUCTIONS (and pass_time_in_window == False), it will be applied to
+                    all windows in a single call whenever they all contain the same number of (evenly spaced) points.
+                    When it has been decorated with @njit_window (and no kwargs are given), the loop over the windows
+                    is compiled with Numba.
         - time0: Starting time of the first window, in the same unit as the given time points.  If None, time0 will be
                  set to time[0].
         - pass_time_in_window: Specifies if the given functions needs the time points in the window.
@@ -33,7 +52,8 @@ def moving_window(time, signal, window_length, time_step, function, time0=None,
                                       time[window_end_index].  Because of gaps in the time series,
                                       time[window_end_index] - time[window_begin_index] < window_length.
                 - window_end_index: See above.
-                - function_output: Whatever function() returned as output for the current window.
+                - function_output: Whatever function() returned as output for the current window (None if it raised a
+                                   ValueError, ZeroDivisionError or FloatingPointError).
     """
 
     if time0 is None:
@@ -50,6 +70,25 @@ def moving_window(time, signal, window_length, time_step, function, time0=None,
         window_begin_time += time_step
         window_end_time += time_step
 
+    # Fast path: apply a NumPy reduction to all windows at once
+
+    if not pass_time_in_window and function in NUMPY_REDUCTIONS:
+
+        windows = _reduce_windows(time, signal, window_begin_time, window_end_time, time_step, function, **kwargs)
+
+        if windows is not None:
+
+            yield from windows
+            return
+
+    # Compiled path: apply a window function that was decorated with @njit_window to all windows in compiled code
+
+    if getattr(function, "is_njit_window", False) and not kwargs:
+
+        yield from _jit_windows(time, signal, window_begin_time, window_end_time, time_step, function,
+                                pass_time_in_window)
+        return
+
     # Loop over the entire time span of the time series, in steps of 'timeStep'.
     # The window length is fixed to 'windowLength', but the number of time points
     # in each window may vary because of gaps.
@@ -57,26 +96,38 @@ def moving_window(time, signal, window_length, time_step, function, time0=None,
     stop_moving_window = False
     function_output = None
 
+    # As the time points are monotonically increasing, the boundaries of the windows only move forward: keep track of
+    # the index of the first time point in the window and of the first time point after the window
+
+    begin_index = 0
+    end_index = 0
+
     while not stop_moving_window:
 
-        window_indices = np.where((time >= window_begin_time) & (time < window_end_time))[0]
+        begin_index += np.searchsorted(time[begin_index:], window_begin_time, side="left")
+        end_index += np.searchsorted(time[end_index:], window_end_time, side="left")
 
-        if len(window_indices) != 0:
+        if end_index > begin_index:
 
-            window_begin_index = window_indices[0]
-            window_end_index = window_indices[-1]
+            window_begin_index = begin_index
+            window_end_index = end_index - 1
+
+            # Only pass the time points and signal in the window itself
+
+            window = slice(begin_index, end_index)
 
             try:
 
                 if pass_time_in_window:
 
-                    function_output = function(time[:window_end_index], signal[:window_end_index], **kwargs)
+                    function_output = function(time[window], signal[window], **kwargs)
 
                 else:
 
-                    function_output = function(signal[:window_end_index], **kwargs)
-            except:
+                    function_output = function(signal[window], **kwargs)
+            except (ValueError, ZeroDivisionError, FloatingPointError) as exc:
 
+                logger.debug(f"Window function failed: {exc}")
                 function_output = None
 
             yield window_begin_time, window_end_time, window_begin_index, window_end_index, function_output
@@ -92,3 +143,182 @@ def moving_window(time, signal, window_length, time_step, function, time0=None,
         else:
 
             stop_moving_window = True
+
+
+def njit_window(function):
+    """ Decorator to compile the given window function with Numba, so that moving_window can run it in compiled code.
+
+    The decorated function must take the signal in the window (or the time points and the signal in the window, when
+    pass_time_in_window == True) as NumPy array(s) and return a single number, e.g.:
+
+        @njit_window
+        def signal_range(signal):
+            return signal.max() - signal.min()
+
+    Note that, unlike in the window-by-window approach, errors raised by the function are not caught.  When Numba is
+    not installed, the function is returned as is.
+
+    Args:
+        - function: Window function to compile.
+
+    Returns: Compiled window function (or the given window function when Numba is not installed).
+    """
+
+    if numba is None:
+        return function
+
+    compiled_function = numba.njit(fastmath=True)(function)
+    compiled_function.is_njit_window = True
+
+    return functools.update_wrapper(compiled_function, function)
+
+
+def _jit_windows(time, signal, window_begin_time, window_end_time, time_step, function, pass_time_in_window):
+    """ Apply the given compiled window function to all windows, in compiled code.
+
+    Args:
+        - time: Time points in the time series.
+        - signal: Metrics points of the time series.
+        - window_begin_time: Start time of the first window, in the same unit as the given time points.
+        - window_end_time: End time of the first window, in the same unit as the given time points.
+        - time_step: Time step between subsequent windows, in the same unit as the given time points.
+        - function: Window function, decorated with @njit_window.
+        - pass_time_in_window: Specifies if the given functions needs the time points in the window.
+
+    Returns: Iterator over the same tuples as moving_window.
+    """
+
+    driver = _get_jit_driver(pass_time_in_window)
+
+    begin_times, end_times, begin_indices, end_indices, function_output = driver(
+        np.asarray(time, dtype=np.float64), np.asarray(signal, dtype=np.float64), window_begin_time, window_end_time,
+        time_step, function)
+
+    # Windows that don't contain any data are skipped
+
+    non_empty = end_indices > begin_indices
+
+    return zip(begin_times[non_empty], end_times[non_empty], begin_indices[non_empty], end_indices[non_empty] - 1,
+               function_output[non_empty])
+
+
+@functools.cache
+def _get_jit_driver(pass_time_in_window):
+    """ Compile the loop over the windows with Numba.
+
+    The driver is only compiled when it is needed for the first time, so that importing this module stays cheap.
+
+    Args:
+        - pass_time_in_window: Specifies if the window function needs the time points in the window.
+
+    Returns: Compiled function that takes the time points, the signal, the start and end time of the first window, the
+             time step and the compiled window function, and returns NumPy arrays with the start time, end time, begin
+             index, end index (exclusive) and window function output (NaN for empty windows) for each window.
+    """
+
+    def driver(time, signal, window_begin_time, window_end_time, time_step, function):
+
+        # Boundaries of all windows (with the same arithmetic as the window-by-window approach)
+
+        num_windows = 1
+        end_time = window_end_time
+
+        while end_time < time[-1]:
+
+            end_time += time_step
+            num_windows += 1
+
+        begin_times = np.empty(num_windows)
+        end_times = np.empty(num_windows)
+
+        begin_times[0] = window_begin_time
+        end_times[0] = window_end_time
+
+        for window in range(1, num_windows):
+
+            begin_times[window] = begin_times[window - 1] + time_step
+            end_times[window] = end_times[window - 1] + time_step
+
+        begin_indices = np.searchsorted(time, begin_times)
+        end_indices = np.searchsorted(time, end_times)
+
+        # Apply the window function to the windows, in parallel
+
+        function_output = np.full(num_windows, np.nan)
+
+        for window in numba.prange(num_windows):
+
+            begin_index = begin_indices[window]
+            end_index = end_indices[window]
+
+            if end_index > begin_index:
+
+                if pass_time_in_window:
+
+                    function_output[window] = function(time[begin_index:end_index], signal[begin_index:end_index])
+
+                else:
+
+                    function_output[window] = function(signal[begin_index:end_index])
+
+        return begin_times, end_times, begin_indices, end_indices, function_output
+
+    return numba.njit(parallel=True)(driver)
+
+
+def _reduce_windows(time, signal, window_begin_time, window_end_time, time_step, reduction, **kwargs):
+    """ Apply the given NumPy reduction to all windows at once, if possible.
+
+    This is only possible when all (non-empty) windows contain the same number of time points and the index of the
+    first time point advances by the same amount from one window to the next.  In that case, the windows are the rows
+    of a strided view on the signal, and the reduction can be applied along its last axis.
+
+    Args:
+        - time: Time points in the time series.
+        - signal: Metrics points of the time series.
+        - window_begin_time: Start time of the first window, in the same unit as the given time points.
+        - window_end_time: End time of the first window, in the same unit as the given time points.
+        - time_step: Time step between subsequent windows, in the same unit as the given time points.
+        - reduction: NumPy reduction to apply to each window (e.g. np.mean).
+        - kwargs: Additional keyword arguments to pass to the given reduction.
+
+    Returns: Iterator over the same tuples as moving_window, or None if the windows don't allow the reduction to be
+             applied to all of them at once.
+    """
+
+    # Boundaries of all windows (with the same arithmetic as the window-by-window approach)
+
+    begin_times = [window_begin_time]
+    end_times = [window_end_time]
+
+    while end_times[-1] < time[-1]:
+
+        begin_times.append(begin_times[-1] + time_step)
+        end_times.append(end_times[-1] + time_step)
+
+    begin_indices = np.searchsorted(time, begin_times, side="left")
+    end_indices = np.searchsorted(time, end_times, side="left")
+
+    # Windows that don't contain any data are skipped
+
+    non_empty = np.flatnonzero(end_indices > begin_indices)
+
+    if len(non_empty) == 0:
+        return iter(())
+
+    begin_times = [begin_times[index] for index in non_empty]
+    end_times = [end_times[index] for index in non_empty]
+    begin_indices = begin_indices[non_empty]
+    end_indices = end_indices[non_empty]
+
+    window_size = end_indices[0] - begin_indices[0]
+    index_step = begin_indices[1] - begin_indices[0] if len(begin_indices) > 1 else 1
+
+    if index_step == 0 or np.any(end_indices - begin_indices != window_size) \
+            or np.any(np.diff(begin_indices) != index_step):
+        return None
+
+    windows = sliding_window_view(signal, window_size)[begin_indices[0]::index_step][:len(begin_indices)]
+    function_output = reduction(windows, axis=-1, **kwargs)
+
+    return zip(begin_times, end_times, begin_indices, end_indices - 1, function_output)